@@ -1,8 +1,21 @@
 # Import needed modules
 import os                         # for clearing the screen and other OS level commands
+import sys                        # for command line arguments
+import socket                     # for talking to the local cache daemon
+import socketserver               # for running the local cache daemon
 import requests                   # for communicating via API
+from requests.adapters import BaseAdapter, HTTPAdapter  # for pooling and caching at the transport level
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import hashlib                    # for HTTP cache keys
 import json                       # for handling JSON
+import io                         # for rendering pages into strings
+import codecs                     # for decoding streamed responses
 import getpass                    # provides a password input without revealing text
+import time                       # for session expiry timestamps
+import threading                  # for the shared rate limiter
+from collections import Counter, OrderedDict  # for collection stats and the note cache
+from concurrent.futures import ThreadPoolExecutor, wait  # for running network calls off the input loop
 from rich.console import Console  # rich terminal output
 from rich.table import Table      # rich tables
 from rich.panel import Panel      # rich panels for menus
@@ -21,6 +34,61 @@ console = Console()
 KNACK_APP_ID = os.environ.get('KNACK_APP_ID', '60241522a16be4001b611249')
 KNACK_API_KEY = os.environ.get('KNACK_API_KEY', '82d8170b-0661-4462-8dbb-3a589abdfc39')
 
+# Network settings
+REQUEST_TIMEOUT = 15  # seconds before a Knack request is abandoned
+STREAM_CHUNK_SIZE = 64 * 1024  # bytes read at a time from streamed responses
+KNACK_HOST = "https://api.knack.com"
+POOL_SIZE = 8  # pooled connections kept open to Knack
+WARM_CONNECTIONS = 2  # connections opened ahead of the login POST and first fetch
+executor = ThreadPoolExecutor(max_workers=4)
+daemon_attached = False  # True when requests go through the local cache daemon
+
+# One session for every request so connections are pooled and reused (the caching adapter is mounted below)
+http = requests.Session()
+
+
+def warm_up():
+    """Open connections to Knack in the background so DNS, TCP and TLS setup is done before we need them."""
+    if daemon_attached:
+        return  # the daemon keeps its own connections warm
+    for _ in range(WARM_CONNECTIONS):
+        executor.submit(http.head, KNACK_HOST + "/v1", timeout=REQUEST_TIMEOUT)
+
+
+def run_with_spinner(message, func, *args, **kwargs):
+    """Run a network call on a worker thread while showing a spinner.
+
+    Returns the call's result, or None if it failed or the user pressed Ctrl+C.
+    A cancelled call is left to finish in the background and its result is discarded.
+    """
+    future = executor.submit(func, *args, **kwargs)
+    try:
+        with console.status(message):
+            while not wait([future], timeout=0.1).done:
+                pass
+        return future.result()
+    except KeyboardInterrupt:
+        future.cancel()
+        console.print("[yellow]Cancelled.[/yellow]")
+    except (requests.exceptions.RequestException, ValueError) as error:
+        console.print(f"[red]Network error:[/red] {error}")
+    return None
+
+
+# Space out requests across threads so we stay under Knack's rate limit
+_rate_lock = threading.Lock()
+_next_request_at = 0.0
+
+def rate_limit():
+    global _next_request_at
+    with _rate_lock:
+        now = time.monotonic()
+        wait_for = _next_request_at - now
+        _next_request_at = max(now, _next_request_at) + 1.0 / KNACK_RATE_LIMIT
+    if wait_for > 0:
+        time.sleep(wait_for)
+
+
 # Knack field ID mappings (mouthpiece object)
 FIELD_MAKE = 'field_17'
 FIELD_MODEL = 'field_16'
@@ -28,6 +96,7 @@ FIELD_TYPE = 'field_24'
 FIELD_THREADS = 'field_25'
 FIELD_FINISH = 'field_26'
 FIELD_NOTE = 'field_27'
+FIELD_MODIFIED = os.environ.get('KNACK_FIELD_MODIFIED', '')  # optional date-modified field for incremental syncs
 
 # Cache for dynamically fetched makes
 _makes_cache = None
@@ -44,8 +113,8 @@ def get_makes():
             "X-Knack-Application-Id": KNACK_APP_ID,
             "X-Knack-REST-API-Key": KNACK_API_KEY
         }
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
+        response = run_with_spinner("Loading makes...", http.get, url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response is not None and response.status_code == 200:
             fields = response.json().get('fields', [])
             for field in fields:
                 if field.get('key') == FIELD_MAKE:
@@ -76,6 +145,218 @@ FIELD_USER_ROLE = 'field_5'
 
 # Pagination settings
 PAGE_SIZE = 10
+KNACK_ROWS_PER_PAGE = 1000  # the most Knack returns per records request
+
+# Let Knack apply filters so only matching records are downloaded
+SERVER_FILTERS = os.environ.get('MOUTHPIECER_SERVER_FILTERS', '') == '1'
+FILTER_FIELDS = {'Make': FIELD_MAKE, 'Type': FIELD_TYPE, 'Finish': FIELD_FINISH}
+
+# Number of notes kept in memory after being read
+NOTE_CACHE_SIZE = 32
+
+# Stats dashboard settings
+TOP_MAKES = 10  # makes shown in the Make x Type pivot
+
+# Catalog analytics settings (all mouthpiecers, via the objects API; an admin opt-in)
+CATALOG_ENABLED = os.environ.get('MOUTHPIECER_CATALOG', '') == '1'
+CATALOG_WORKERS = 4  # pages fetched concurrently
+KNACK_RATE_LIMIT = 10  # Knack allows 10 API requests per second
+CATALOG_FIELDS = {'Make': FIELD_MAKE, 'Model': FIELD_MODEL, 'Type': FIELD_TYPE, 'Threads': FIELD_THREADS, 'Finish': FIELD_FINISH}
+
+# Local storage for the persisted session and cached collection
+CONFIG_DIR = os.environ.get('MOUTHPIECER_HOME', os.path.join(os.path.expanduser('~'), '.mouthpiecer'))
+SESSION_FILE = os.path.join(CONFIG_DIR, 'session.json')
+COLLECTION_FILE = os.path.join(CONFIG_DIR, 'collection.json')
+CATALOG_FILE = os.path.join(CONFIG_DIR, 'catalog.json')
+HTTP_CACHE_DIR = os.path.join(CONFIG_DIR, 'http_cache')
+HTTP_CACHE_MAX_BYTES = 20 * 1024 * 1024  # least recently used responses are evicted past this
+HTTP_CACHE_STALE_AGE = 60 * 60  # seconds before a leftover partial or temporary file is removed
+DAEMON_SOCKET = os.environ.get('MOUTHPIECER_DAEMON_SOCKET', os.path.join(CONFIG_DIR, 'daemon.sock'))
+DAEMON_TTL = 30  # seconds a GET response is shared between instances before asking Knack again
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that keeps GET responses on disk and revalidates them.
+
+    Responses carrying an ETag or Last-Modified header are stored under a key made
+    from the URL and the caller's auth identity. Later requests for the same key are
+    sent with If-None-Match/If-Modified-Since, and a 304 is answered from disk.
+    """
+
+    def __init__(self, cache_dir, max_bytes, **kwargs):
+        super().__init__(**kwargs)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = None  # loaded from index.json on first use
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, stream=stream, **kwargs)
+
+        key = self.cache_key(request)
+        entry = self.lookup(key)
+        if entry is not None:
+            if entry.get('etag'):
+                request.headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().send(request, stream=True, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            try:
+                body = open(self.body_path(key), 'rb')
+            except OSError:
+                # Evicted since we looked it up; forget it and ask again without validators
+                with self.lock:
+                    self.load_index().pop(key, None)
+                    self.save_index()
+                request.headers.pop('If-None-Match', None)
+                request.headers.pop('If-Modified-Since', None)
+                return self.send(request, stream=stream, **kwargs)
+            with self.lock:
+                self.load_index(reload=True).setdefault(key, entry)['used'] = time.time()
+                self.save_index()
+            return self.cached_response(request, response, entry, body)
+        if response.status_code == 200 and 'no-store' not in response.headers.get('Cache-Control', ''):
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                return self.store(request, response, key, etag, last_modified, dict(stream=stream, **kwargs))
+        return response
+
+    def cache_key(self, request):
+        identity = request.headers.get('Authorization') or request.headers.get('X-Knack-REST-API-Key', '')
+        return hashlib.sha256(f"{request.url}\n{identity}".encode()).hexdigest()
+
+    def body_path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load_index(self, reload=False):
+        # Other instances share index.json, so re-read it before changing it
+        if self.entries is None or reload:
+            try:
+                with open(os.path.join(self.cache_dir, 'index.json'), 'r') as indexfile:
+                    self.entries = json.load(indexfile)
+            except (OSError, ValueError):
+                self.entries = {}
+        return self.entries
+
+    def save_index(self):
+        # Write a temporary file and swap it in, so readers never see a half-written index
+        index_path = os.path.join(self.cache_dir, 'index.json')
+        temp_path = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            with open(temp_path, 'w') as indexfile:
+                json.dump(self.entries, indexfile)
+            os.replace(temp_path, index_path)
+        except OSError:
+            self.discard(temp_path)  # only costs us cache entries, never the response
+
+    def lookup(self, key):
+        with self.lock:
+            entry = self.load_index().get(key)
+            if entry is not None and not os.path.exists(self.body_path(key)):
+                del self.entries[key]
+                entry = None
+            return entry
+
+    def store(self, request, response, key, etag, last_modified, send_kwargs):
+        # Write the (decompressed) body to disk as it streams in
+        path = self.body_path(key)
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            bodyfile = open(partial, 'wb')
+        except OSError:
+            return response  # can't cache right now; hand the response over untouched
+        size = 0
+        try:
+            with response, bodyfile:
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    bodyfile.write(chunk)
+                    size += len(chunk)
+        except requests.exceptions.RequestException:
+            self.discard(partial)
+            raise
+        except OSError:
+            # The disk filled up or the cache went away mid-download; fetch it again uncached
+            self.discard(partial)
+            return super().send(request, **send_kwargs)
+
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': {'Content-Type': response.headers.get('Content-Type', 'application/json')},
+            'size': size,
+            'used': time.time(),
+        }
+        with self.lock:
+            # Rename, open and index in one go, so an eviction never sees the body unindexed
+            try:
+                os.replace(partial, path)
+                body = open(path, 'rb')  # opened before evicting, so even an oversized body can be served
+            except OSError:
+                self.discard(partial)
+                body = None
+            else:
+                self.load_index(reload=True)[key] = entry
+                self.evict()
+                self.save_index()
+        if body is None:
+            return super().send(request, **send_kwargs)
+        return self.cached_response(request, response, entry, body)
+
+    def evict(self):
+        # Remove bodies no index entry points at (dropped by another instance's index write),
+        # and partial or temporary files left behind by a crash. Both must have sat untouched
+        # for a while, so files another instance is still writing or indexing are left alone.
+        now = time.time()
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            names = []
+        for name in names:
+            if name == 'index.json' or name in self.entries:
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stale = now - os.path.getmtime(path) > HTTP_CACHE_STALE_AGE
+            except OSError:
+                continue  # already renamed or removed by its writer
+            if stale:
+                self.discard(path)
+
+        total = sum(entry['size'] for entry in self.entries.values())
+        for key in sorted(self.entries, key=lambda key: self.entries[key]['used']):
+            if total <= self.max_bytes:
+                break
+            total -= self.entries.pop(key)['size']
+            self.discard(self.body_path(key))
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def cached_response(self, request, original, entry, body):
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = original.url
+        response.request = request
+        response.connection = self
+        response.raw = body  # streamed from disk by iter_content
+        return response
+
+
+http.mount(KNACK_HOST, CachingAdapter(HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, pool_connections=1, pool_maxsize=POOL_SIZE))
+SESSION_TTL = 60 * 60 * 24 * 2  # Knack sessions last 48 hours
 
 # declare some vars
 token = ""
@@ -83,8 +364,14 @@ with open('banner.txt', 'r') as bannerfile:
     banner = bannerfile.read()
 mpcselect = 0
 mouthpieces = []  # list of mouthpiece dicts from API
+mpc_index = {}  # normalized (Make, Model, Type, Threads, Finish) -> list of indexes into mouthpieces
+mpc_index_partial = False  # True when only a server-filtered subset is loaded, so duplicates may be missed
+data_version = 0  # bumped whenever the collection changes
 current_page = 0  # for pagination
 current_filters = {}  # e.g., {'Make': 'Holton', 'Type': 'rim'}
+refresh_future = None  # background refresh in flight, if any
+collection_synced = None  # when the whole collection was last synced (high-water mark for delta syncs)
+collection_owner = None  # email of the user the loaded collection and high-water mark belong to
 
 
 # Login process
@@ -94,6 +381,7 @@ def login():
     if token != "":
         input("Please log out first. Press Enter...")
     else:
+        warm_up()  # connect while the user types
         print("Please log in...")
         print()
         logemail = input("Email: ")
@@ -101,10 +389,13 @@ def login():
         api_url = f"https://api.knack.com/v1/applications/{KNACK_APP_ID}/session"
         creds = {"email": logemail, "password": passwd}
         headers = {"content-type":"application/json", "X-Knack-REST-API-KEY": KNACK_API_KEY}
-        response = requests.post(api_url, data=json.dumps(creds), headers=headers)
-        jresponse = response.json()
-        if response.status_code == 200:
-            token = jresponse['session']['user']['token']
+        response = run_with_spinner("Logging in...", http.post, api_url, data=json.dumps(creds), headers=headers, timeout=REQUEST_TIMEOUT)
+        if response is None:
+            input("Press Enter to continue...")
+        elif response.status_code == 200:
+            token = response.json()['session']['user']['token']
+            reset_collection()
+            save_session()
             print()
             input("You have been logged in. Press Enter to continue...")
         else:
@@ -119,9 +410,11 @@ def loginnewusr():
     api_url = f"https://api.knack.com/v1/applications/{KNACK_APP_ID}/session"
     creds = {"email": newusremail, "password": newusrpasswd1}
     headers = {"content-type":"application/json", "X-Knack-REST-API-KEY": KNACK_API_KEY}
-    response = requests.post(api_url, data=json.dumps(creds), headers=headers)
-    jresponse = response.json()
-    token = jresponse['session']['user']['token']
+    response = run_with_spinner("Logging in...", http.post, api_url, data=json.dumps(creds), headers=headers, timeout=REQUEST_TIMEOUT)
+    if response is not None and response.status_code == 200:
+        token = response.json()['session']['user']['token']
+        reset_collection()
+        save_session()
 
 
 # Logout process
@@ -132,6 +425,99 @@ def logout():
     else:
         input("You will be logged out. Press Enter...")
         token = ""
+        clear_session()
+        reset_collection()
+
+
+# Forget everything loaded for the previous user, so it can't leak into the next one's collection
+def reset_collection():
+    global mouthpieces, collection_synced, collection_owner, refresh_future, current_filters, current_page
+    mouthpieces = []
+    collection_synced = None
+    collection_owner = None
+    refresh_future = None  # a refresh still in flight belongs to the previous user
+    current_filters = {}
+    current_page = 0
+    index_mouthpieces()
+    _note_cache.clear()
+
+
+# Save the session token so the next launch can skip the login prompt
+def save_session():
+    os.makedirs(CONFIG_DIR, mode=0o700, exist_ok=True)
+    session = {'email': logemail, 'token': token, 'expires': time.time() + SESSION_TTL}
+    # Create the file readable by the current user only
+    fd = os.open(SESSION_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as sessionfile:
+        json.dump(session, sessionfile)
+
+
+# Restore a saved session (validated lazily by the first request that uses it)
+def load_session():
+    global token, logemail
+    try:
+        with open(SESSION_FILE, 'r') as sessionfile:
+            session = json.load(sessionfile)
+    except (OSError, ValueError):
+        return False
+    if not session.get('token') or session.get('expires', 0) < time.time():
+        clear_session()
+        return False
+    token = session['token']
+    logemail = session['email']
+    return True
+
+
+# Forget the saved session and cached collection
+def clear_session():
+    for path in (SESSION_FILE, COLLECTION_FILE):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# Check whether Knack rejected our session token, and prompt for a new login if so
+def session_rejected(response):
+    global token
+    if response.status_code not in (401, 403):
+        return False
+    token = ""
+    clear_session()
+    reset_collection()
+    print()
+    console.print("[red]Your session has expired.[/red] ", end="")
+    input("Press Enter to log in again...")
+    print()
+    login()
+    return True
+
+
+# Save the fetched collection so the next launch can show it straight away
+def save_collection():
+    os.makedirs(CONFIG_DIR, mode=0o700, exist_ok=True)
+    fd = os.open(COLLECTION_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as collectionfile:
+        json.dump({'email': logemail, 'synced': collection_synced, 'mouthpieces': mouthpieces}, collectionfile)
+
+
+# Load the cached collection for the logged in user
+def load_collection():
+    global mouthpieces, collection_synced, collection_owner
+    try:
+        with open(COLLECTION_FILE, 'r') as collectionfile:
+            cached = json.load(collectionfile)
+    except (OSError, ValueError):
+        return False
+    if cached.get('email') != logemail:
+        return False
+    if any('HasNote' not in mpc for mpc in cached.get('mouthpieces', [])):
+        return False  # cached before notes were loaded on demand
+    mouthpieces = cached.get('mouthpieces', [])
+    collection_synced = cached.get('synced')
+    collection_owner = logemail
+    index_mouthpieces()
+    return True
 
 
 # Our Main Menu
@@ -145,7 +531,6 @@ def mainmenu():
             "[green][6][/green] Log in\n"
             "[dim][7][/dim] Log out\n"
             "[green][8][/green] Add a user\n"
-            "[green][0][/green] Exit to shell"
         )
     else:
         menu_content = (
@@ -154,40 +539,46 @@ def mainmenu():
             "[dim][6][/dim] Log in\n"
             "[green][7][/green] Log out\n"
             "[dim][8][/dim] Add a user\n"
-            "[green][0][/green] Exit to shell"
         )
+    if CATALOG_ENABLED:
+        menu_content += "[green][9][/green] Catalog analytics\n"
+    menu_content += "[green][0][/green] Exit to shell"
     console.print(Panel(menu_content, title="Main Menu", border_style="blue"))
     print()
 
 
 # My Mouthpieces Menu
-def mympcsmenu():
-    global mpcselect
-    clear_screen()
-    console.print(f"[yellow]{banner}[/yellow]")
+def mympcsmenu(out, state):
+    out.print(f"[yellow]{banner}[/yellow]")
 
     # Show current filter status
     filter_status = ""
-    if current_filters:
-        filter_parts = [f"{k}=[cyan]{v}[/cyan]" for k, v in current_filters.items()]
+    if state['filters']:
+        filter_parts = [f"{k}=[cyan]{v}[/cyan]" for k, v in state['filters'].items()]
         filter_status = f"\n[yellow]Filters:[/yellow] {', '.join(filter_parts)}  [dim]([/dim][green]c[/green][dim] to clear)[/dim]"
+    if state['refreshing']:
+        filter_status += "\n[dim]Refreshing from Knack... press Enter to update, Ctrl+C to cancel[/dim]"
 
-    if mpcselect == 0:
+    if state['mpcselect'] == 0:
         menu_content = (
             "[green][1][/green] Add mouthpiece      [green][3][/green] Edit mouthpiece\n"
             "[green][2][/green] Delete mouthpiece   [green][4][/green] View details\n"
-            "[green][5][/green] Filter              [green][0][/green] Back to main menu"
+            "[green][5][/green] Filter              [green][6][/green] Duplicate mouthpiece\n"
+            "[green]\\[r][/green] Refresh from Knack  [green]\\[s][/green] Stats dashboard\n"
+            "[green][0][/green] Back to main menu"
             f"{filter_status}"
         )
     else:
         menu_content = (
             "[dim][1][/dim] Add mouthpiece      [dim][3][/dim] Edit mouthpiece\n"
             "[dim][2][/dim] Delete mouthpiece   [dim][4][/dim] View details\n"
-            "[dim][5][/dim] Filter              [dim][0][/dim] Back to main menu"
+            "[dim][5][/dim] Filter              [dim][6][/dim] Duplicate mouthpiece\n"
+            "[dim]\\[r][/dim] Refresh from Knack  [dim]\\[s][/dim] Stats dashboard\n"
+            "[dim][0][/dim] Back to main menu"
             f"{filter_status}"
         )
-    console.print(Panel(menu_content, title=f"Mouthpieces for [blue]{logemail}[/blue]", border_style="blue"))
-    print()
+    out.print(Panel(menu_content, title=f"Mouthpieces for [blue]{state['email']}[/blue]", border_style="blue"))
+    out.print()
 
 
 # Menu for selecting a mouthpiece type
@@ -222,12 +613,16 @@ def mpcfinishmenu():
     print()
 
 
-# Add mouthpiece process
-def addmpc():
+# Add mouthpiece process (optionally seeded from an existing mouthpiece)
+def addmpc(template=None):
     print()
+    if template:
+        console.print("[dim]Press Enter to keep the value from the mouthpiece you're duplicating[/dim]")
+        print()
     newmake = questionary.autocomplete(
         "Make:",
         choices=get_makes(),
+        default=template['Make'] if template else "",
         validate=validate_make,
         style=questionary.Style([("answer", "fg:green")])
     ).ask()
@@ -235,10 +630,16 @@ def addmpc():
         mympcs(refresh=False)
         return
     print()
-    newmodel = input("Model: ")
+    if template:
+        newmodel = input(f"Model ({template['Model']}): ") or template['Model']
+    else:
+        newmodel = input("Model: ")
     mpctypemenu()
     while True:
-        option = input("Type: ")
+        option = input(f"Type ({template['Type']}): " if template else "Type: ")
+        if option == "" and template:
+            newtype = template['Type']
+            break
         try:
             option = (int(option))
             if option not in (1, 2, 3, 4):
@@ -260,7 +661,7 @@ def addmpc():
     if newtype != "one-piece":
         mpcthreadsmenu()
         while True:
-            option = input("Threads: ")
+            option = input(f"Threads ({template['Threads']}): " if template else "Threads: ")
             try:
                 if option not in ("1", "2", "3", ""):
                     raise ValueError
@@ -276,10 +677,13 @@ def addmpc():
         elif option == "3":
             newthreads = "other"
         elif option == "":
-            newthreads = ""
+            newthreads = template['Threads'] if template else ""
     mpcfinishmenu()
     while True:
-        option = input("Finish: ")
+        option = input(f"Finish ({template['Finish']}): " if template else "Finish: ")
+        if option == "" and template:
+            newfinish = template['Finish']
+            break
         try:
             option = (int(option))
             if option not in (1, 2, 3, 4, 5, 6, 7):
@@ -304,7 +708,11 @@ def addmpc():
     elif option == 7:
         newfinish = "plastic"
     print()
-    newnote = input("Note (optional): ")
+    if template:
+        current_note_display = template['Note'][:30] + "..." if len(template['Note']) > 30 else template['Note']
+        newnote = input(f"Note ({current_note_display}): ") or template['Note']
+    else:
+        newnote = input("Note (optional): ")
     print()
     summary = (
         f"[bold]Make:[/bold] [green]{newmake}[/green]\n"
@@ -318,6 +726,7 @@ def addmpc():
         summary += f"\n[bold]Note:[/bold] [green]{newnote}[/green]"
     console.print(Panel(summary, title="New Mouthpiece", border_style="green"))
     print()
+    warn_duplicates(find_duplicates(newmake, newmodel, newtype, newthreads, newfinish))
     while True:
         console.print("Send to Knack? [green](Y/n):[/green] ", end="")
         conf = input().lower()
@@ -332,7 +741,10 @@ def addmpc():
         api_url = "https://api.knack.com/v1/pages/scene_18/views/view_18/records"
         mouthpiece = {FIELD_MAKE: newmake, FIELD_TYPE: newtype, FIELD_MODEL: newmodel, FIELD_THREADS: newthreads, FIELD_FINISH: newfinish, FIELD_NOTE: newnote}
         headers = {"content-type":"application/json", "X-Knack-Application-Id": KNACK_APP_ID, "X-Knack-REST-API-KEY":"knack", "Authorization":token}
-        response = requests.post(api_url, data=json.dumps(mouthpiece), headers=headers)
+        response = run_with_spinner("Sending to Knack...", http.post, api_url, data=json.dumps(mouthpiece), headers=headers, timeout=REQUEST_TIMEOUT)
+        if response is None or session_rejected(response):
+            mympcs()  # the change may still have reached Knack
+            return
         print()
         if response.status_code == 200:
             input("Success! Press Enter to continue...")
@@ -348,48 +760,81 @@ def addmpc():
 
 # My mouthpieces process
 def mympcs(refresh=True):
-    global mouthpieces, current_page, current_filters
+    global mouthpieces, current_page, current_filters, refresh_future
     if token == "":
         input("Please log in first. Press Enter...")
     else:
         if refresh:
-            fetchmpcs()
+            if not fetchmpcs() and token == "":
+                return  # session was rejected and the user didn't log back in
             current_page = 0
-        mympcsmenu()
-        listmpcs()
+        show_page()
 
         filtered = get_filtered_mouthpieces()
         total_pages = (len(filtered) + PAGE_SIZE - 1) // PAGE_SIZE if filtered else 1
 
         while True:
-            selection = input("Make a menu selection: ")
+            try:
+                selection = input("Make a menu selection: ")
+            except KeyboardInterrupt:
+                # Ctrl+C cancels a background refresh and keeps the current data
+                print()
+                if refresh_future is None:
+                    raise
+                refresh_future = None
+                console.print("[yellow]Refresh cancelled.[/yellow]")
+                print()
+                continue
+
+            # Pick up a background refresh that finished while we were waiting
+            if finish_refresh():
+                filtered = get_filtered_mouthpieces()
+                total_pages = (len(filtered) + PAGE_SIZE - 1) // PAGE_SIZE if filtered else 1
+                if selection == "":
+                    show_page()
+                    continue
+            elif token == "":
+                return  # session was rejected and the user didn't log back in
+            elif selection == "" and refresh_future is not None:
+                console.print("[dim]Still refreshing...[/dim]")
+                print()
+                continue
 
             # Handle pagination
             if selection == "<":
                 if current_page > 0:
                     current_page -= 1
-                mympcsmenu()
-                listmpcs()
+                show_page()
                 continue
             elif selection == ">":
                 if current_page < total_pages - 1:
                     current_page += 1
-                mympcsmenu()
-                listmpcs()
+                show_page()
+                continue
+            # Handle refresh from Knack
+            elif selection.lower() == "r":
+                start_refresh()
+                show_page()
                 continue
+            # Handle stats dashboard
+            elif selection.lower() == "s":
+                statsmpc()
+                return
             # Handle clear filter
             elif selection.lower() == "c":
                 current_filters = {}
                 current_page = 0
-                mympcsmenu()
-                listmpcs()
+                if SERVER_FILTERS:
+                    mympcs()  # reload the whole collection
+                    return
+                show_page()
                 filtered = get_filtered_mouthpieces()
                 total_pages = (len(filtered) + PAGE_SIZE - 1) // PAGE_SIZE if filtered else 1
                 continue
 
             try:
                 selection = (int(selection))
-                if selection not in (1, 2, 3, 4, 5, 0):
+                if selection not in (1, 2, 3, 4, 5, 6, 0):
                     raise ValueError
             except ValueError:
                 console.print("[red]Invalid Option[/red]")
@@ -406,88 +851,421 @@ def mympcs(refresh=True):
             viewmpc()
         elif selection == 5:
             filtermpc()
+        elif selection == 6:
+            dupmpc()
         elif selection == 0:
             current_filters = {}  # Clear filters when leaving
             mainmenu()
 
 
-# Fetch mouthpieces from API (separate from display)
-def fetchmpcs():
-    global mouthpieces
+# Translate our filters (and a modified-since timestamp) into Knack query parameters for a records request
+def knack_query(filters, since=None):
+    params = {}
+    rules = [{"field": FILTER_FIELDS[field], "operator": "is", "value": value} for field, value in (filters or {}).items()]
+    if since is not None:
+        # Knack compares dates by day in the app's timezone, which can be up to a day either side
+        # of UTC, so look back two UTC days to be sure the day we send is before the sync began
+        after = time.strftime('%m/%d/%Y', time.gmtime(since - 2 * 60 * 60 * 24))
+        rules.append({"field": FIELD_MODIFIED, "operator": "is after", "value": after})
+    if rules:
+        params['filters'] = json.dumps({"match": "and", "rules": rules})
+    return params
+
+
+# Download mouthpiece records from the API (runs on a worker thread)
+def download_mpcs(auth_token, filters=None, since=None):
     api_url = "https://api.knack.com/v1/pages/scene_18/views/view_18/records"
-    headers = {"content-type":"application/json", "X-Knack-Application-Id": KNACK_APP_ID, "X-Knack-REST-API-KEY":"knack", "Authorization":token}
-    response = requests.get(api_url, headers=headers)
-    jresponse = response.json()
+    headers = {"content-type":"application/json", "X-Knack-Application-Id": KNACK_APP_ID, "X-Knack-REST-API-KEY":"knack", "Authorization":auth_token, "Accept-Encoding":"gzip"}
+    params = knack_query(filters, since)
+    params['rows_per_page'] = KNACK_ROWS_PER_PAGE
 
-    # Store mouthpieces as list of dicts
-    mouthpieces = []
-    for idx, record in enumerate(jresponse.get('records', [])):
-        mouthpieces.append({
-            'index': idx,
-            'id': record.get('id', ''),
-            'Make': record.get(FIELD_MAKE, ''),
-            'Model': record.get(FIELD_MODEL, ''),
-            'Type': record.get(FIELD_TYPE, ''),
-            'Threads': record.get(FIELD_THREADS, ''),
-            'Finish': record.get(FIELD_FINISH, ''),
-            'Note': record.get(FIELD_NOTE, ''),
-        })
+    # Build the new list of dicts without touching the current collection
+    records = []
+    page = 1
+    while True:
+        params['page'] = page
+        response = http.get(api_url, headers=headers, params=params, stream=True, timeout=REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            response.close()
+            return response, None
+        count = 0
+        with response:
+            for record in iter_records(response):
+                records.append(project_record(len(records), record))
+                count += 1
+        # A short page means there are no more records
+        if count < KNACK_ROWS_PER_PAGE:
+            return response, records
+        page += 1
+
+
+# Ask Knack how many mouthpieces the user has, using a one-row request (runs on a worker thread)
+def count_mpcs(auth_token):
+    api_url = "https://api.knack.com/v1/pages/scene_18/views/view_18/records"
+    headers = {"content-type":"application/json", "X-Knack-Application-Id": KNACK_APP_ID, "X-Knack-REST-API-KEY":"knack", "Authorization":auth_token}
+    response = http.get(api_url, headers=headers, params={'rows_per_page': 1}, timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        return response, None
+    return response, response.json().get('total_records', 0)
+
+
+# Merge the records changed since the last sync into a copy of the collection (runs on a worker thread)
+def sync_mpcs(auth_token, current, synced):
+    response, changed = download_mpcs(auth_token, since=synced)
+    if changed is None:
+        return response, None
+    merged = {mpc['id']: mpc for mpc in current}
+    merged.update((mpc['id'], mpc) for mpc in changed)
+
+    # Deletions don't show up as changes; the view has no id-only listing, so when
+    # the count is off a full download becomes the new collection
+    response, total = count_mpcs(auth_token)
+    if total is None:
+        return response, None
+    if total != len(merged):
+        return download_mpcs(auth_token)
+
+    return response, [dict(mpc, index=idx) for idx, mpc in enumerate(merged.values())]
+
+
+# Refresh the collection, fetching only what changed when we can (runs on a worker thread)
+def refresh_mpcs(auth_token, filters, current, synced):
+    started = time.time()
+    if FIELD_MODIFIED and synced and not filters:
+        response, records = sync_mpcs(auth_token, current, synced)
+    else:
+        response, records = download_mpcs(auth_token, filters)
+    return response, records, started
+
+
+# Decode records one at a time from a streamed Knack records response
+_json_decoder = json.JSONDecoder()
+
+def iter_records(response):
+    """Yield each record in a records response without loading the whole body.
+
+    Only the current chunk and the record being decoded are held in memory.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+    buf = ''
+
+    # Skip ahead to the start of the records array
+    while True:
+        start = buf.find('"records"')
+        bracket = buf.find('[', start) if start != -1 else -1
+        if bracket != -1:
+            pos = bracket + 1
+            break
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError("No records in the response from Knack")
+        buf += decoder.decode(chunk)
+
+    while True:
+        # Skip the separators between records
+        while pos < len(buf) and buf[pos] in ' \t\r\n,':
+            pos += 1
+        if pos < len(buf):
+            if buf[pos] == ']':
+                return
+            try:
+                record, pos = _json_decoder.raw_decode(buf, pos)
+            except ValueError:
+                pass  # record continues in the next chunk
+            else:
+                yield record
+                continue
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError("Incomplete records response from Knack")
+        buf = buf[pos:] + decoder.decode(chunk)
+        pos = 0
+
+
+# Map a Knack record onto the fields the list shows (raw, note and other fields are dropped)
+def project_record(idx, record):
+    return {
+        'index': idx,
+        'id': record.get('id', ''),
+        'Make': record.get(FIELD_MAKE, ''),
+        'Model': record.get(FIELD_MODEL, ''),
+        'Type': record.get(FIELD_TYPE, ''),
+        'Threads': record.get(FIELD_THREADS, ''),
+        'Finish': record.get(FIELD_FINISH, ''),
+        'HasNote': bool(record.get(FIELD_NOTE)),  # the note itself is loaded on demand
+    }
+
+
+# Swap a finished download into the collection (main thread only)
+def apply_download(result):
+    global mouthpieces, collection_synced, collection_owner
+    if result is None:
+        return False  # cancelled or failed; keep what we have
+    response, records, started = result
+    if session_rejected(response):
+        # Try again if the user logged back in
+        return token != "" and fetchmpcs()
+    if records is None:
+        console.print("[red]Error! There was a problem fetching your mouthpieces.[/red]")
+        return False
+    mouthpieces = records
+    index_mouthpieces(partial=SERVER_FILTERS and bool(current_filters))
+    _note_cache.clear()  # notes may have changed too
+    if SERVER_FILTERS and current_filters:
+        collection_synced = None  # only a subset is loaded; the next refresh must be a full one
+    else:
+        collection_synced = started
+        collection_owner = logemail
+        save_collection()  # only cache the whole collection
+    return True
+
+
+# High-water mark for a delta sync, or None when the loaded collection isn't the logged in user's
+def sync_mark():
+    if collection_owner != logemail:
+        return None
+    return collection_synced
+
+
+# Fetch mouthpieces from API (separate from display)
+def fetchmpcs():
+    global refresh_future
+    refresh_future = None  # a foreground fetch supersedes any background refresh
+    filters = dict(current_filters) if SERVER_FILTERS else None
+    return apply_download(run_with_spinner("Fetching mouthpieces...", refresh_mpcs, token, filters, list(mouthpieces), sync_mark()))
+
+
+# Start refreshing the collection in the background, keeping the current data usable
+def start_refresh():
+    global refresh_future
+    if refresh_future is None:
+        filters = dict(current_filters) if SERVER_FILTERS else None
+        refresh_future = executor.submit(refresh_mpcs, token, filters, list(mouthpieces), sync_mark())
+
+
+# Apply a background refresh if it has finished; returns True if the collection changed
+def finish_refresh():
+    global refresh_future
+    if refresh_future is None or not refresh_future.done():
+        return False
+    future = refresh_future
+    refresh_future = None
+    try:
+        result = future.result()
+    except (requests.exceptions.RequestException, ValueError) as error:
+        console.print(f"[red]Network error:[/red] {error}")
+        return False
+    return apply_download(result)
+
+
+# Recently read notes, keyed by record id
+_note_cache = OrderedDict()
+
+
+# Download a single record's note from the API (runs on a worker thread)
+def download_note(auth_token, mpcid):
+    api_url = "https://api.knack.com/v1/pages/scene_18/views/view_18/records/" + mpcid
+    headers = {"content-type":"application/json", "X-Knack-Application-Id": KNACK_APP_ID, "X-Knack-REST-API-KEY":"knack", "Authorization":auth_token}
+    return http.get(api_url, headers=headers, timeout=REQUEST_TIMEOUT)
+
+
+# Get a mouthpiece's note, fetching it if we haven't read it recently (None if it couldn't be loaded)
+def get_note(mpc):
+    if not mpc['HasNote']:
+        return ""
+    if mpc['id'] in _note_cache:
+        _note_cache.move_to_end(mpc['id'])
+        return _note_cache[mpc['id']]
+    response = run_with_spinner("Loading note...", download_note, token, mpc['id'])
+    if response is None:
+        return None
+    if session_rejected(response):
+        # Logging back in emptied the collection; reload it so callers return to a full list
+        if token != "":
+            fetchmpcs()
+        return None
+    if response.status_code != 200:
+        return None
+    note = response.json().get(FIELD_NOTE, '')
+    _note_cache[mpc['id']] = note
+    if len(_note_cache) > NOTE_CACHE_SIZE:
+        _note_cache.popitem(last=False)
+    return note
+
+
+# Normalized key used to spot duplicate mouthpieces
+def mpc_key(make, model, mpctype, threads, finish):
+    if mpctype == "one-piece":
+        threads = ""  # threads don't apply to one-piece mouthpieces
+    return tuple(" ".join(str(value).split()).casefold() for value in (make, model, mpctype, threads, finish))
+
+
+# Rebuild the duplicate index after the collection changes
+def index_mouthpieces(partial=False):
+    global mpc_index, mpc_index_partial, data_version
+    data_version += 1  # invalidates the stats cube
+    mpc_index = {}
+    mpc_index_partial = partial
+    for pos, mpc in enumerate(mouthpieces):
+        key = mpc_key(mpc['Make'], mpc['Model'], mpc['Type'], mpc['Threads'], mpc['Finish'])
+        mpc_index.setdefault(key, []).append(pos)
+
+
+# Look up existing mouthpieces matching the given values (optionally ignoring one record)
+def find_duplicates(make, model, mpctype, threads, finish, exclude_id=None):
+    key = mpc_key(make, model, mpctype, threads, finish)
+    return [mouthpieces[pos] for pos in mpc_index.get(key, []) if mouthpieces[pos]['id'] != exclude_id]
+
+
+# Warn about duplicates before saving
+def warn_duplicates(duplicates):
+    if duplicates:
+        matches = ", ".join(f"[{mpc['index']}] {mpc['Make']} {mpc['Model']}" for mpc in duplicates)
+        console.print(f"[yellow]You already have this mouthpiece:[/yellow] {matches}")
+    if mpc_index_partial:
+        console.print("[dim]Only mouthpieces matching the current filter were checked for duplicates.[/dim]")
+    if duplicates or mpc_index_partial:
+        print()
 
 
 # Get filtered list of mouthpieces
-def get_filtered_mouthpieces():
-    if not current_filters:
+def get_filtered_mouthpieces(filters=None):
+    if filters is None:
+        filters = current_filters
+    if not filters:
         return mouthpieces
     result = mouthpieces
-    for field, value in current_filters.items():
+    for field, value in filters.items():
         result = [mpc for mpc in result if mpc[field] == value]
     return result
 
 
+# Aggregation cube: (Make, Type, Finish, Threads) -> count, built once per data version.
+# Kept as one (version, cube, slices) tuple so page pre-rendering threads always see a matching set.
+_stats_cube = None
+
+
+def get_stats_cube():
+    global _stats_cube
+    version = data_version  # read before the data, so a concurrent swap only makes the cube look stale
+    if _stats_cube is None or _stats_cube[0] != version:
+        cube = Counter()
+        for mpc in mouthpieces:
+            threads = "" if mpc['Type'] == "one-piece" else mpc['Threads']
+            cube[(mpc['Make'], mpc['Type'], mpc['Finish'], threads)] += 1
+        _stats_cube = (version, cube, {})  # slices of this cube are memoized by filters
+    return _stats_cube
+
+
+# Aggregate the cube cells that match the given filters
+def stats_slice(filters):
+    version, cube, slices = get_stats_cube()
+    key = tuple(sorted(filters.items()))
+    if key in slices:
+        return slices[key]
+
+    result = {
+        'total': 0,
+        'Make': Counter(), 'Type': Counter(), 'Finish': Counter(), 'Threads': Counter(),
+        'Make x Type': Counter(), 'Type x Finish': Counter(),
+    }
+    for (make, mpctype, finish, threads), count in cube.items():
+        cell = {'Make': make, 'Type': mpctype, 'Finish': finish}
+        if any(cell[field] != value for field, value in filters.items()):
+            continue
+        result['total'] += count
+        result['Make'][make] += count
+        result['Type'][mpctype] += count
+        result['Finish'][finish] += count
+        if threads:
+            result['Threads'][threads] += count
+        result['Make x Type'][(make, mpctype)] += count
+        result['Type x Finish'][(mpctype, finish)] += count
+    slices[key] = result
+    return result
+
+
 # Generate collection stats
-def get_stats():
-    filtered = get_filtered_mouthpieces()
-    if not filtered:
-        if current_filters:
+def get_stats(filters=None):
+    if filters is None:
+        filters = current_filters
+    stats = stats_slice(filters)
+    if not stats['total']:
+        if filters:
             return "No mouthpieces match the current filters"
         return "No mouthpieces yet"
 
-    total = len(filtered)
-    unique_makes = len(set(mpc['Make'] for mpc in filtered))
-
-    # Count by type
-    type_counts = {}
-    for mpc in filtered:
-        t = mpc['Type']
-        type_counts[t] = type_counts.get(t, 0) + 1
+    type_str = ", ".join(f"{count} {typ}" for typ, count in stats['Type'].items())
+
+    summary = f"[bold]{stats['total']}[/bold] mouthpieces | [bold]{len(stats['Make'])}[/bold] makes | {type_str}"
+    if filters:
+        summary += f" [dim](filtered)[/dim]"
+    return summary
+
+
+# Build a pivot table of counts with a total column
+def pivot_table(title, counts, rows, columns):
+    table = Table(title=title)
+    table.add_column("", style="bold")
+    for column in columns:
+        table.add_column(column or "-", justify="right")
+    table.add_column("Total", justify="right", style="bold")
+    for row in rows:
+        cells = [counts.get((row, column), 0) for column in columns]
+        table.add_row(row or "-", *(str(cell) if cell else "[dim]0[/dim]" for cell in cells), str(sum(cells)))
+    return table
+
+
+# Build a bar chart of a distribution
+def distribution_table(title, counts):
+    table = Table(title=title)
+    table.add_column("Value")
+    table.add_column("Count", justify="right")
+    table.add_column("")
+    biggest = max(counts.values(), default=0)
+    for value, count in counts.most_common():
+        table.add_row(value or "-", str(count), "[magenta]" + "█" * max(1, count * 30 // biggest) + "[/magenta]")
+    return table
+
+
+# Stats dashboard process
+def statsmpc():
+    clear_screen()
+    console.print(f"[yellow]{banner}[/yellow]")
+    console.print(Panel(get_stats(), title="Collection Stats", border_style="magenta"))
+    print()
 
-    type_str = ", ".join(f"{count} {typ}" for typ, count in type_counts.items())
+    stats = stats_slice(current_filters)
+    if stats['total']:
+        types = sorted(stats['Type'])
+        finishes = sorted(stats['Finish'])
+        top_makes = [make for make, count in stats['Make'].most_common(TOP_MAKES)]
+        console.print(pivot_table(f"Top {len(top_makes)} makes by type", stats['Make x Type'], top_makes, types))
+        print()
+        console.print(pivot_table("Type by finish", stats['Type x Finish'], types, finishes))
+        print()
+        console.print(distribution_table("Finish", stats['Finish']))
+        print()
+        if stats['Threads']:
+            console.print(distribution_table("Threads", stats['Threads']))
+            print()
 
-    stats = f"[bold]{total}[/bold] mouthpieces | [bold]{unique_makes}[/bold] makes | {type_str}"
-    if current_filters:
-        stats += f" [dim](filtered)[/dim]"
-    return stats
+    input("Press Enter to continue...")
+    mympcs(refresh=False)
 
 
 # List mouthpieces process (with pagination and filtering)
-def listmpcs():
-    global current_page
-
-    filtered = get_filtered_mouthpieces()
+def listmpcs(out, page, state):
+    filtered = get_filtered_mouthpieces(state['filters'])
     total = len(filtered)
     total_pages = (total + PAGE_SIZE - 1) // PAGE_SIZE if total > 0 else 1
 
-    # Ensure current_page is valid
-    if current_page >= total_pages:
-        current_page = total_pages - 1
-    if current_page < 0:
-        current_page = 0
-
     # Show stats
-    console.print(Panel(get_stats(), title="Collection Stats", border_style="magenta"))
-    print()
+    out.print(Panel(get_stats(state['filters']), title="Collection Stats", border_style="magenta"))
+    out.print()
 
-    # Build rich table for current page
+    # Build rich table for the page
     table = Table()
     table.add_column("Index", style="dim")
     table.add_column("Make")
@@ -497,12 +1275,12 @@ def listmpcs():
     table.add_column("Finish")
     table.add_column("Note", justify="center")
 
-    start_idx = current_page * PAGE_SIZE
+    start_idx = page * PAGE_SIZE
     end_idx = min(start_idx + PAGE_SIZE, total)
 
-    style = "green" if mpcselect == 1 else None
+    style = "green" if state['mpcselect'] == 1 else None
     for mpc in filtered[start_idx:end_idx]:
-        has_note = "X" if mpc['Note'] else ""
+        has_note = "X" if mpc['HasNote'] else ""
         # Hide threads for one-piece mouthpieces
         threads_display = "-" if mpc['Type'] == "one-piece" else mpc['Threads']
         table.add_row(
@@ -516,12 +1294,77 @@ def listmpcs():
             style=style
         )
 
-    console.print(table)
+    out.print(table)
 
     # Show pagination info if more than one page
     if total_pages > 1:
-        console.print(f"\n[dim]Page {current_page + 1} of {total_pages} | [/dim][green][<][/green][dim] prev [/dim][green][>][/green][dim] next[/dim]")
-    print()
+        out.print(f"\n[dim]Page {page + 1} of {total_pages} | [/dim][green][<][/green][dim] prev [/dim][green][>][/green][dim] next[/dim]")
+    out.print()
+
+
+# Rendered My mouthpieces pages, keyed by page number and everything else shown on them
+_page_memo = {}
+_page_memo_lock = threading.Lock()
+
+
+# Snapshot what the My mouthpieces screen shows (main thread only, so pre-rendering never sees a half-made change)
+def page_state():
+    return {
+        'version': data_version,
+        'filters': dict(current_filters),
+        'mpcselect': mpcselect,
+        'refreshing': refresh_future is not None,
+        'email': logemail,
+        'width': console.width,
+    }
+
+
+# Memo key for a page: its number plus everything else shown on it
+def page_key(page, state):
+    return (page, state['version'], tuple(sorted(state['filters'].items())), state['mpcselect'], state['refreshing'], state['email'], state['width'])
+
+
+# Render a page of the My mouthpieces screen, or reuse it if it's already been rendered
+def render_page(page, state):
+    key = page_key(page, state)
+    with _page_memo_lock:
+        if key in _page_memo:
+            return _page_memo[key]
+
+    out = Console(file=io.StringIO(), force_terminal=console.is_terminal, color_system=console.color_system, width=state['width'])
+    mympcsmenu(out, state)
+    listmpcs(out, page, state)
+    rendered = out.file.getvalue()
+
+    with _page_memo_lock:
+        _page_memo[key] = rendered
+    return rendered
+
+
+# Draw the current page, then render its neighbours in the background for instant paging
+def show_page():
+    global current_page
+    filtered = get_filtered_mouthpieces()
+    total_pages = (len(filtered) + PAGE_SIZE - 1) // PAGE_SIZE if filtered else 1
+
+    # Ensure current_page is valid
+    if current_page >= total_pages:
+        current_page = total_pages - 1
+    if current_page < 0:
+        current_page = 0
+
+    state = page_state()
+    current = page_key(current_page, state)[1:]
+    with _page_memo_lock:
+        # Pages for other data, filters or menus will never be shown again
+        for stale in [memo_key for memo_key in _page_memo if memo_key[1:] != current]:
+            del _page_memo[stale]
+    clear_screen()
+    console.file.write(render_page(current_page, state))
+    console.file.flush()
+    for page in (current_page + 1, current_page - 1):
+        if 0 <= page < total_pages:
+            executor.submit(render_page, page, state)
 
 
 # Delete mouthpiece process
@@ -534,8 +1377,7 @@ def delmpc():
     else:
         global mpcselect
         mpcselect = 1
-        mympcsmenu()
-        listmpcs()
+        show_page()
         print("Make a menu selection: 2")
         print()
         while True:
@@ -565,16 +1407,19 @@ def delmpc():
             delid = mpc['id']
             api_url = "https://api.knack.com/v1/pages/scene_18/views/view_18/records/" + delid
             headers = {"content-type":"application/json", "X-Knack-Application-Id": KNACK_APP_ID, "X-Knack-REST-API-KEY":"knack", "Authorization":token}
-            response = requests.delete(api_url, headers=headers)
+            response = run_with_spinner("Deleting from Knack...", http.delete, api_url, headers=headers, timeout=REQUEST_TIMEOUT)
+            mpcselect = 0
+            if response is None or session_rejected(response):
+                mympcs()
+                return
             print()
             if response.status_code == 200:
+                _note_cache.pop(delid, None)
                 input("Success! Press Enter to continue...")
-                mpcselect = 0
                 mympcs()  # refresh=True to show updated list
             else:
                 console.print("[red]Error! There was a problem with your request.[/red] ", end="")
                 input("Press Enter to continue...")
-                mpcselect = 0
                 mympcs(refresh=False)
         else:
             mpcselect = 0
@@ -585,8 +1430,7 @@ def delmpc():
 def editmpc():
     global mpcselect
     mpcselect = 1
-    mympcsmenu()
-    listmpcs()
+    show_page()
     print("Make a menu selection: 3")
     print()
     while True:
@@ -602,6 +1446,13 @@ def editmpc():
         break
     print()
     mpc = mouthpieces[selection]
+    note = get_note(mpc)
+    if note is None:
+        console.print("[red]Error! Could not load the note for this mouthpiece.[/red] ", end="")
+        input("Press Enter to continue...")
+        mpcselect = 0
+        mympcs(refresh=False)
+        return
     console.print("[dim]Press Enter to keep current value (for Make: start typing or press Enter)[/dim]")
     print()
 
@@ -677,8 +1528,8 @@ def editmpc():
 
     # Note (Enter keeps current)
     print()
-    current_note_display = mpc['Note'][:30] + "..." if len(mpc['Note']) > 30 else mpc['Note']
-    newnote = input(f"Note ({current_note_display}): ") or mpc['Note']
+    current_note_display = note[:30] + "..." if len(note) > 30 else note
+    newnote = input(f"Note ({current_note_display}): ") or note
 
     print()
     old_summary = (
@@ -689,8 +1540,8 @@ def editmpc():
     if mpc['Type'] != "one-piece":
         old_summary += f"[bold]Threads:[/bold] [red]{mpc['Threads']}[/red]\n"
     old_summary += f"[bold]Finish:[/bold] [red]{mpc['Finish']}[/red]"
-    if mpc['Note']:
-        old_summary += f"\n[bold]Note:[/bold] [red]{mpc['Note']}[/red]"
+    if note:
+        old_summary += f"\n[bold]Note:[/bold] [red]{note}[/red]"
     console.print(Panel(old_summary, title="OLD", border_style="red"))
 
     print()
@@ -707,6 +1558,7 @@ def editmpc():
     console.print(Panel(new_summary, title="NEW", border_style="green"))
 
     print()
+    warn_duplicates(find_duplicates(newmake, newmodel, newtype, newthreads, newfinish, exclude_id=mpc['id']))
     while True:
         console.print("Save changes? [green](Y/n):[/green] ", end="")
         conf = input().lower()
@@ -722,16 +1574,19 @@ def editmpc():
         api_url = "https://api.knack.com/v1/pages/scene_18/views/view_18/records/" + editid
         mouthpiece = {FIELD_MAKE: newmake, FIELD_TYPE: newtype, FIELD_MODEL: newmodel, FIELD_THREADS: newthreads, FIELD_FINISH: newfinish, FIELD_NOTE: newnote}
         headers = {"content-type":"application/json", "X-Knack-Application-Id": KNACK_APP_ID, "X-Knack-REST-API-KEY":"knack", "Authorization":token}
-        response = requests.put(api_url, data=json.dumps(mouthpiece), headers=headers)
+        response = run_with_spinner("Saving to Knack...", http.put, api_url, data=json.dumps(mouthpiece), headers=headers, timeout=REQUEST_TIMEOUT)
+        mpcselect = 0
+        if response is None or session_rejected(response):
+            mympcs()
+            return
         print()
         if response.status_code == 200:
+            _note_cache.pop(editid, None)
             input("Success! Press Enter to continue...")
-            mpcselect = 0
             mympcs()  # refresh=True to show updated list
         else:
             console.print("[red]Error! There was a problem with your request.[/red] ", end="")
             input("Press Enter to continue...")
-            mpcselect = 0
             mympcs(refresh=False)
     else:
         mpcselect = 0
@@ -741,8 +1596,7 @@ def editmpc():
 def viewmpc():
     global mpcselect
     mpcselect = 1
-    mympcsmenu()
-    listmpcs()
+    show_page()
     print("Make a menu selection: 4")
     print()
     while True:
@@ -767,8 +1621,11 @@ def viewmpc():
         details += f"[bold]Threads:[/bold] [cyan]{mpc['Threads']}[/cyan]\n"
     details += f"[bold]Finish:[/bold]  [cyan]{mpc['Finish']}[/cyan]"
 
-    if mpc['Note']:
-        details += f"\n\n[bold]Note:[/bold]\n[yellow]{mpc['Note']}[/yellow]"
+    note = get_note(mpc)
+    if note is None:
+        details += "\n\n[bold]Note:[/bold]\n[red]Could not load the note[/red]"
+    elif note:
+        details += f"\n\n[bold]Note:[/bold]\n[yellow]{note}[/yellow]"
     else:
         details += "\n\n[bold]Note:[/bold]\n[dim]No note[/dim]"
 
@@ -779,6 +1636,36 @@ def viewmpc():
     mympcs(refresh=False)
 
 
+# Duplicate mouthpiece process (use an existing mouthpiece as a template)
+def dupmpc():
+    global mpcselect
+    mpcselect = 1
+    show_page()
+    print("Make a menu selection: 6")
+    print()
+    while True:
+        selection = input("Select a mouthpiece by Index to duplicate: ")
+        try:
+            selection = (int(selection))
+            if selection not in range(0, len(mouthpieces)):
+                raise ValueError
+        except ValueError:
+            console.print("[red]Invalid Option[/red]")
+            print()
+            continue
+        break
+    template = mouthpieces[selection]
+    note = get_note(template)
+    if note is None:
+        console.print("[red]Error! Could not load the note for this mouthpiece.[/red] ", end="")
+        input("Press Enter to continue...")
+        mpcselect = 0
+        mympcs(refresh=False)
+        return
+    mpcselect = 0
+    addmpc(template=dict(template, Note=note))
+
+
 # Filter mouthpieces
 def filtermpc():
     global current_filters, current_page
@@ -824,6 +1711,8 @@ def filtermpc():
         if selected_make:
             current_filters['Make'] = selected_make
             current_page = 0
+            mympcs(refresh=SERVER_FILTERS)
+            return
         mympcs(refresh=False)
         return
 
@@ -867,7 +1756,112 @@ def filtermpc():
     # Apply filter (adds to existing filters)
     current_filters[field] = values[val_selection - 1]
     current_page = 0
-    mympcs(refresh=False)
+    mympcs(refresh=SERVER_FILTERS)
+
+
+# Fetch one page of every mouthpiecer's records from the objects API (runs on a worker thread)
+def download_catalog_page(page, params, rows_per_page=KNACK_ROWS_PER_PAGE):
+    api_url = "https://api.knack.com/v1/objects/object_4/records"
+    headers = {"X-Knack-Application-Id": KNACK_APP_ID, "X-Knack-REST-API-Key": KNACK_API_KEY, "Accept-Encoding": "gzip"}
+    rate_limit()
+    response = http.get(api_url, headers=headers, params=dict(params, page=page, rows_per_page=rows_per_page), timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+# Crawl the catalog, optionally only records modified since a timestamp (runs on a worker thread)
+def crawl_catalog(since=None):
+    params = knack_query(None, since)
+
+    # A one-row request tells us how many pages to fetch
+    total = download_catalog_page(1, params, rows_per_page=1).get('total_records', 0)
+    pages = (total + KNACK_ROWS_PER_PAGE - 1) // KNACK_ROWS_PER_PAGE
+    records = {}
+    with ThreadPoolExecutor(max_workers=CATALOG_WORKERS) as pool:
+        for jresponse in pool.map(lambda page: download_catalog_page(page, params), range(1, pages + 1)):
+            for record in jresponse.get('records', []):
+                records[record['id']] = {field: record.get(key, '') for field, key in CATALOG_FIELDS.items()}
+    return records
+
+
+# Bring the local catalog store up to date (runs on a worker thread)
+def sync_catalog(catalog):
+    started = time.time()
+    if catalog and FIELD_MODIFIED:
+        records = dict(catalog['records'])
+        records.update(crawl_catalog(since=catalog['synced']))
+        # Deleted records can't be seen in a modified-since crawl; recrawl if the count is off
+        total = download_catalog_page(1, {}, rows_per_page=1).get('total_records', 0)
+        if total != len(records):
+            records = crawl_catalog()
+    else:
+        records = crawl_catalog()
+    return {'synced': started, 'records': records}
+
+
+# Load the local catalog store
+def load_catalog():
+    try:
+        with open(CATALOG_FILE, 'r') as catalogfile:
+            return json.load(catalogfile)
+    except (OSError, ValueError):
+        return None
+
+
+# Save the local catalog store
+def save_catalog(catalog):
+    os.makedirs(CONFIG_DIR, mode=0o700, exist_ok=True)
+    fd = os.open(CATALOG_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as catalogfile:
+        json.dump(catalog, catalogfile)
+
+
+# Catalog analytics process (rankings across every mouthpiecer's collection)
+def catalogmpcs():
+    catalog = load_catalog()
+    selection = "r" if catalog is None else ""
+    while True:
+        if selection.lower() == "r":
+            synced = run_with_spinner("Crawling the catalog...", sync_catalog, catalog)
+            if synced is not None:
+                catalog = synced
+                save_catalog(catalog)
+        if catalog is None:
+            input("Press Enter to continue...")
+            return
+
+        clear_screen()
+        console.print(f"[yellow]{banner}[/yellow]")
+        records = catalog['records'].values()
+        total = len(catalog['records'])
+        makes = Counter(mpc['Make'] for mpc in records)
+        models = Counter((mpc['Make'], mpc['Model']) for mpc in records)
+        finishes = Counter(mpc['Finish'] for mpc in records)
+        synced_at = time.strftime('%Y-%m-%d %H:%M', time.localtime(catalog['synced']))
+        summary = f"[bold]{total}[/bold] mouthpieces | [bold]{len(makes)}[/bold] makes | [bold]{len(models)}[/bold] models [dim](synced {synced_at})[/dim]"
+        console.print(Panel(summary, title="Catalog Analytics", border_style="magenta"))
+        print()
+        console.print(distribution_table(f"Top {TOP_MAKES} most-owned makes", Counter(dict(makes.most_common(TOP_MAKES)))))
+        print()
+
+        # Rarity: how many of each model exist across all collections, rarest first
+        rarity = Table(title=f"Rarest {TOP_MAKES} models")
+        rarity.add_column("Make")
+        rarity.add_column("Model")
+        rarity.add_column("Owned", justify="right")
+        rarity.add_column("Share", justify="right")
+        for (make, model), count in sorted(models.items(), key=lambda item: (item[1], item[0]))[:TOP_MAKES]:
+            rarity.add_row(make, model, str(count), f"{100 * count / total:.2f}%")
+        console.print(rarity)
+        one_of_a_kind = sum(1 for count in models.values() if count == 1)
+        console.print(f"[dim]{one_of_a_kind} models are one of a kind[/dim]")
+        print()
+        console.print(distribution_table("Finish mix", finishes))
+        print()
+
+        selection = input("Press r to refresh, or Enter to go back: ")
+        if selection.lower() != "r":
+            return
 
 
 # Add user process
@@ -879,6 +1873,7 @@ def addusr():
     if token != "":
         input("Please log out before adding a user. Press Enter...")
     else:
+        warm_up()  # connect while the user types
         newusrfname = str(input("First name: "))
         print()
         newusrlname = str(input("Last name: "))
@@ -905,8 +1900,8 @@ def addusr():
                 FIELD_USER_ROLE: "Mouthpiecer"
             }
             headers = {"content-type":"application/json", "X-Knack-Application-Id": KNACK_APP_ID, "X-Knack-REST-API-KEY": KNACK_API_KEY}
-            response = requests.post(api_url, data=json.dumps(newusr), headers=headers)
-            if response.status_code == 200:
+            response = run_with_spinner("Sending to Knack...", http.post, api_url, data=json.dumps(newusr), headers=headers, timeout=REQUEST_TIMEOUT)
+            if response is not None and response.status_code == 200:
                 loginnewusr()
                 print()
                 input("Success! You have been added and logged in. Let's add your first mouthpiece. Press Enter to continue...")
@@ -924,12 +1919,183 @@ def rusr():
     input("Press Enter to send to Knack...")
     api_url = "https://api.knack.com/v1/objects/object_1/records/" + usrid
     headers = {"content-type":"application/json", "X-Knack-Application-Id": KNACK_APP_ID, "X-Knack-REST-API-KEY": KNACK_API_KEY}
-    response = requests.get(api_url, headers=headers)
+    response = run_with_spinner("Fetching user...", http.get, api_url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response is None:
+        return
     print(response.json())
     print(response.status_code)
 
 
+# Transport adapter used by TUI instances attached to the cache daemon
+class DaemonAdapter(BaseAdapter):
+    """Send requests over the daemon's Unix socket instead of opening our own connections."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        body = request.body.decode() if isinstance(request.body, bytes) else request.body
+        message = {'method': request.method, 'url': request.url, 'headers': dict(request.headers), 'body': body}
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout[-1] if isinstance(timeout, tuple) else timeout)
+            sock.connect(self.path)
+            sock.sendall(json.dumps(message).encode() + b"\n")
+            reply = sock.makefile('rb')
+        except OSError as error:
+            sock.close()
+            raise requests.exceptions.ConnectionError(f"Cache daemon unavailable: {error}", request=request)
+        sock.close()  # the reply file keeps the connection open until it is closed itself
+        try:
+            head = json.loads(reply.readline())
+        except (OSError, ValueError) as error:
+            reply.close()
+            raise requests.exceptions.ConnectionError(f"Cache daemon unavailable: {error}", request=request)
+
+        response = requests.Response()
+        response.status_code = head['status']
+        response.headers = CaseInsensitiveDict(head['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = reply  # the body follows the header line until the daemon closes the socket
+        return response
+
+    def close(self):
+        pass
+
+
+# Route Knack requests through the cache daemon if one is running
+def attach_daemon():
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(DAEMON_SOCKET):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.connect(DAEMON_SOCKET)
+    except OSError:
+        return False
+    http.mount(KNACK_HOST, DaemonAdapter(DAEMON_SOCKET))
+    return True
+
+
+# GET responses shared by every attached instance: (identity, url) -> (expires, status, headers, body)
+_daemon_memo = {}
+_daemon_inflight = {}  # (identity, url) -> Event set when the request in flight finishes
+_daemon_lock = threading.Lock()
+
+
+# Fetch a GET through the daemon's caches, so identical requests from several instances cost one Knack request
+def daemon_get(identity, url, headers):
+    key = (identity, url)
+    while True:
+        with _daemon_lock:
+            cached = _daemon_memo.get(key)
+            if cached is not None and cached[0] > time.time():
+                return cached[1:]
+            pending = _daemon_inflight.get(key)
+            if pending is None:
+                pending = _daemon_inflight[key] = threading.Event()
+                break
+        pending.wait()  # another instance is already asking for this
+
+    try:
+        rate_limit()
+        response = http.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        result = (response.status_code, {'Content-Type': response.headers.get('Content-Type', 'application/json')}, response.content)
+        if response.status_code == 200:
+            with _daemon_lock:
+                now = time.time()
+                for stale in [k for k, v in _daemon_memo.items() if v[0] <= now]:
+                    del _daemon_memo[stale]
+                _daemon_memo[key] = (now + DAEMON_TTL,) + result
+        return result
+    finally:
+        with _daemon_lock:
+            del _daemon_inflight[key]
+        pending.set()
+
+
+# Forward a write to Knack, dropping the shared responses it may have changed
+def daemon_send(identity, method, url, headers, body):
+    with _daemon_lock:
+        for key in [key for key in _daemon_memo if key[0] == identity]:
+            del _daemon_memo[key]
+    rate_limit()
+    response = http.request(method, url, headers=headers, data=body, timeout=REQUEST_TIMEOUT)
+    return response.status_code, {'Content-Type': response.headers.get('Content-Type', 'application/json')}, response.content
+
+
+# Handle one request from an attached instance
+class DaemonHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        try:
+            message = json.loads(self.rfile.readline())
+        except ValueError:
+            return  # a probe from attach_daemon, or a client that went away
+        url = message.get('url', '')
+        # Pass through only what requests will work out again for the upstream connection
+        headers = CaseInsensitiveDict(message.get('headers', {}))
+        for name in ('Host', 'Content-Length', 'Connection'):
+            headers.pop(name, None)
+        identity = headers.get('Authorization') or headers.get('X-Knack-REST-API-Key', '')
+
+        if not url.startswith(KNACK_HOST + "/"):
+            status, reply_headers, body = 403, {}, b""  # only ever talk to Knack
+        else:
+            try:
+                if message['method'] == 'GET':
+                    status, reply_headers, body = daemon_get(identity, url, headers)
+                else:
+                    status, reply_headers, body = daemon_send(identity, message['method'], url, headers, message.get('body'))
+            except requests.exceptions.RequestException as error:
+                status, reply_headers, body = 502, {'Content-Type': 'text/plain'}, str(error).encode()
+        self.wfile.write(json.dumps({'status': status, 'headers': reply_headers}).encode() + b"\n")
+        self.wfile.write(body)
+
+
+# Cache daemon process: owns the connections, rate limiter and caches for every instance on this host
+def run_daemon():
+    if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+        print("The cache daemon needs Unix domain sockets, which this platform doesn't have.")
+        return
+    if attach_daemon():
+        print(f"A cache daemon is already running on {DAEMON_SOCKET}")
+        return
+    os.makedirs(os.path.dirname(DAEMON_SOCKET), mode=0o700, exist_ok=True)
+    try:
+        os.remove(DAEMON_SOCKET)  # left behind by a daemon that didn't shut down cleanly
+    except OSError:
+        pass
+    server = socketserver.ThreadingUnixStreamServer(DAEMON_SOCKET, DaemonHandler)
+    server.daemon_threads = True
+    os.chmod(DAEMON_SOCKET, 0o660)  # owner and group can attach
+    warm_up()
+    console.print(f"Cache daemon listening on [blue]{DAEMON_SOCKET}[/blue]. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.server_close()
+        os.remove(DAEMON_SOCKET)
+
+
 # Here's where the program runs
+if '--daemon' in sys.argv:
+    run_daemon()
+    sys.exit()
+daemon_attached = attach_daemon()
+warm_up()  # connect while the banner and menu are shown
+if load_session():
+    # Go straight to the collection, showing the cached copy while it refreshes
+    if load_collection():
+        start_refresh()
+        mympcs(refresh=False)
+    else:
+        mympcs()
 mainmenu()
 option = input("Enter your choice: ")
 
@@ -946,6 +2112,9 @@ while option != "0":
     elif option == "8":
         print()
         addusr()
+    elif option == "9" and CATALOG_ENABLED:
+        print()
+        catalogmpcs()
     else:
         print()
         console.print("[red]Invalid option selected.[/red] ", end="")